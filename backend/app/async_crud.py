@@ -0,0 +1,83 @@
+"""AsyncSession variants of the functions in crud.py"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Row, delete, desc, func, select
+from sqlalchemy.exc import SQLAlchemyError
+from . import models, schemas
+from .crud import _bulk_insert_stmt, _visit_values
+from .exceptions import DatabaseException
+from typing import List, Optional, Tuple
+
+
+def _visits_for_url(url: str):
+    return select(models.PageVisit).where(
+        models.PageVisit.url == url
+    ).order_by(desc(models.PageVisit.datetime_visited), desc(models.PageVisit.id))
+
+
+async def create_page_visit(db: AsyncSession, visit: schemas.PageVisitCreate) -> models.PageVisit:
+    try:
+        db_visit = models.PageVisit(**_visit_values(visit))
+        db.add(db_visit)
+        await db.commit()
+        await db.refresh(db_visit)
+        return db_visit
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseException(f"Failed to create page visit: {str(e)}")
+
+
+async def create_page_visits_bulk(db: AsyncSession, visits: List[schemas.PageVisitCreate]) -> List[Row]:
+    if not visits:
+        return []
+    try:
+        result = await db.execute(_bulk_insert_stmt(), [_visit_values(visit) for visit in visits])
+        rows = result.all()
+        await db.commit()
+        return sorted(rows, key=lambda row: row.id)
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseException(f"Failed to create page visits: {str(e)}")
+
+
+async def get_visits_by_url(db: AsyncSession, url: str, limit: int = 50) -> List[models.PageVisit]:
+    try:
+        result = await db.scalars(_visits_for_url(url).limit(limit))
+        return list(result)
+    except SQLAlchemyError as e:
+        raise DatabaseException(f"Failed to retrieve visits: {str(e)}")
+
+
+async def get_visits_by_url_paginated(
+    db: AsyncSession, 
+    url: str, 
+    page: int = 1, 
+    page_size: int = 50
+) -> Tuple[List[models.PageVisit], int]:
+    try:
+        total = await db.scalar(
+            select(func.count()).select_from(models.PageVisit).where(models.PageVisit.url == url)
+        )
+        result = await db.scalars(
+            _visits_for_url(url).offset((page - 1) * page_size).limit(page_size)
+        )
+        return list(result), total
+    except SQLAlchemyError as e:
+        raise DatabaseException(f"Failed to retrieve visits: {str(e)}")
+
+
+async def get_latest_metrics(db: AsyncSession, url: str) -> Optional[models.PageVisit]:
+    try:
+        return await db.scalar(_visits_for_url(url).limit(1))
+    except SQLAlchemyError as e:
+        raise DatabaseException(f"Failed to retrieve metrics: {str(e)}")
+
+
+async def delete_visits_by_url(db: AsyncSession, url: str) -> int:
+    try:
+        result = await db.execute(delete(models.PageVisit).where(models.PageVisit.url == url))
+        await db.commit()
+        return result.rowcount
+    except SQLAlchemyError as e:
+        await db.rollback()
+        raise DatabaseException(f"Failed to delete visits: {str(e)}")
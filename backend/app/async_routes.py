@@ -0,0 +1,48 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from . import schemas
+from .database import get_async_db
+from .services import AsyncPageVisitService
+
+router = APIRouter()
+
+@router.post("/api/visits", response_model=schemas.PageVisitResponse)
+async def create_visit(visit: schemas.PageVisitCreate, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncPageVisitService.create_visit(db, visit)
+
+@router.post("/api/visits/bulk", response_model=schemas.BulkPageVisitResponse)
+async def create_visits_bulk(bulk: schemas.BulkPageVisitCreate, db: AsyncSession = Depends(get_async_db)):
+    return await AsyncPageVisitService.create_visits_bulk(db, bulk)
+
+@router.get("/api/visits", response_model=List[schemas.PageVisitResponse])
+async def get_visits(
+    url: str = Query(..., description="URL to fetch visits for"),
+    limit: int = Query(50, description="Maximum number of visits to return", ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncPageVisitService.get_visits_by_url(db, url, limit)
+
+@router.get("/api/visits/paginated", response_model=schemas.PaginatedResponse[schemas.PageVisitResponse])
+async def get_visits_paginated(
+    url: str = Query(..., description="URL to fetch visits for"),
+    page: int = Query(1, description="Page number", ge=1),
+    page_size: int = Query(50, description="Items per page", ge=1, le=100),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncPageVisitService.get_visits_by_url_paginated(db, url, page, page_size)
+
+@router.delete("/api/visits")
+async def delete_visits(
+    url: str = Query(..., description="URL to delete visits for"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    count = await AsyncPageVisitService.delete_visits_by_url(db, url)
+    return {"deleted": count, "url": url}
+
+@router.get("/api/metrics/current", response_model=schemas.PageMetrics)
+async def get_current_metrics(
+    url: str = Query(..., description="URL to fetch metrics for"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    return await AsyncPageVisitService.get_latest_metrics(db, url)
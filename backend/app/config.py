@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Optional
 from functools import lru_cache
 
 
@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     app_version: str = "1.0.0"
     
     database_url: str
+    database_async_url: Optional[str] = None
+    db_async: bool = False
     
     cors_origins: str = "http://localhost:3000,chrome-extension://*"
     cors_credentials: bool = True
@@ -20,10 +22,26 @@ class Settings(BaseSettings):
     db_pool_timeout: int = 30
     db_pool_recycle: int = 3600
     
+    ingest_chunk_size: int = 5000
+    
     class Config:
         env_file = ".env"
         case_sensitive = False
     
+    @property
+    def async_database_url(self) -> str:
+        """Async driver URL, derived from database_url unless set explicitly"""
+        if self.database_async_url:
+            return self.database_async_url
+        scheme, sep, rest = self.database_url.partition("://")
+        driver = {
+            "postgresql": "postgresql+asyncpg",
+            "postgresql+psycopg2": "postgresql+asyncpg",
+            "postgres": "postgresql+asyncpg",
+            "sqlite": "sqlite+aiosqlite",
+        }.get(scheme, scheme)
+        return f"{driver}{sep}{rest}"
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Parse CORS origins from comma-separated string"""
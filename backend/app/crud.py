@@ -1,19 +1,36 @@
+import csv
+import io
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import Row, desc, func, insert
 from sqlalchemy.exc import SQLAlchemyError
 from . import models, schemas
 from .exceptions import DatabaseException
 from typing import List, Optional, Tuple
 
 
+def _visit_values(visit: schemas.PageVisitCreate) -> dict:
+    return {
+        "url": visit.url,
+        "link_count": visit.link_count,
+        "word_count": visit.word_count,
+        "image_count": visit.image_count
+    }
+
+
+def _bulk_insert_stmt():
+    return insert(models.PageVisit).returning(
+        models.PageVisit.id,
+        models.PageVisit.url,
+        models.PageVisit.datetime_visited,
+        models.PageVisit.link_count,
+        models.PageVisit.word_count,
+        models.PageVisit.image_count
+    )
+
+
 def create_page_visit(db: Session, visit: schemas.PageVisitCreate) -> models.PageVisit:
     try:
-        db_visit = models.PageVisit(
-            url=visit.url,
-            link_count=visit.link_count,
-            word_count=visit.word_count,
-            image_count=visit.image_count
-        )
+        db_visit = models.PageVisit(**_visit_values(visit))
         db.add(db_visit)
         db.commit()
         db.refresh(db_visit)
@@ -23,27 +40,50 @@ def create_page_visit(db: Session, visit: schemas.PageVisitCreate) -> models.Pag
         raise DatabaseException(f"Failed to create page visit: {str(e)}")
 
 
-def create_page_visits_bulk(db: Session, visits: List[schemas.PageVisitCreate]) -> List[models.PageVisit]:
+def create_page_visits_bulk(db: Session, visits: List[schemas.PageVisitCreate]) -> List[Row]:
+    if not visits:
+        return []
     try:
-        db_visits = [
-            models.PageVisit(
-                url=visit.url,
-                link_count=visit.link_count,
-                word_count=visit.word_count,
-                image_count=visit.image_count
-            )
-            for visit in visits
-        ]
-        db.add_all(db_visits)
+        rows = db.execute(_bulk_insert_stmt(), [_visit_values(visit) for visit in visits]).all()
         db.commit()
-        for visit in db_visits:
-            db.refresh(visit)
-        return db_visits
+        # RETURNING order is not guaranteed for multi-row VALUES; ids are
+        # assigned in parameter order, so sorting restores the input order.
+        return sorted(rows, key=lambda row: row.id)
     except SQLAlchemyError as e:
         db.rollback()
         raise DatabaseException(f"Failed to create page visits: {str(e)}")
 
 
+def copy_page_visits(db: Session, visits: List[schemas.PageVisitCreate]) -> int:
+    """Load visits with COPY FROM STDIN on PostgreSQL, executemany elsewhere."""
+    if not visits:
+        return 0
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for visit in visits:
+                writer.writerow((visit.url, visit.link_count, visit.word_count, visit.image_count))
+            buffer.seek(0)
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(
+                    "COPY page_visits (url, link_count, word_count, image_count) "
+                    "FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            finally:
+                cursor.close()
+        else:
+            db.execute(insert(models.PageVisit), [_visit_values(visit) for visit in visits])
+        db.commit()
+        return len(visits)
+    except Exception as e:
+        # The raw COPY cursor raises DBAPI errors rather than SQLAlchemyError
+        db.rollback()
+        raise DatabaseException(f"Failed to copy page visits: {str(e)}")
+
+
 def get_visits_by_url(db: Session, url: str, limit: int = 50) -> List[models.PageVisit]:
     try:
         return db.query(models.PageVisit).filter(
@@ -1,8 +1,8 @@
-from fastapi import FastAPI, Depends, Query
+from fastapi import APIRouter, FastAPI, Depends, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
-from typing import List
-from . import models, schemas
+from typing import List, Optional
+from . import async_routes, models, schemas
 from .database import engine, get_db
 from .config import settings
 from .exceptions import register_exception_handlers
@@ -22,19 +22,32 @@ app.add_middleware(
     allow_headers=settings.cors_headers_list,
 )
 
+# Core visit/metrics routes; swapped for their AsyncSession twins in
+# async_routes when settings.db_async is enabled.
+router = APIRouter()
+
 @app.get("/")
 def root():
     return {"message": "Protego History API", "status": "running"}
 
-@app.post("/api/visits", response_model=schemas.PageVisitResponse)
+@router.post("/api/visits", response_model=schemas.PageVisitResponse)
 def create_visit(visit: schemas.PageVisitCreate, db: Session = Depends(get_db)):
     return PageVisitService.create_visit(db, visit)
 
-@app.post("/api/visits/bulk", response_model=schemas.BulkPageVisitResponse)
+@router.post("/api/visits/bulk", response_model=schemas.BulkPageVisitResponse)
 def create_visits_bulk(bulk: schemas.BulkPageVisitCreate, db: Session = Depends(get_db)):
     return PageVisitService.create_visits_bulk(db, bulk)
 
-@app.get("/api/visits", response_model=List[schemas.PageVisitResponse])
+@app.post("/api/visits/ingest", response_model=schemas.StreamIngestResponse)
+async def ingest_visits(
+    request: Request,
+    format: str = Query("ndjson", description="Body format: ndjson or csv (with header row)"),
+    chunk_size: Optional[int] = Query(None, description="Rows per COPY chunk", ge=1, le=50000),
+    db: Session = Depends(get_db)
+):
+    return await PageVisitService.ingest_visits_stream(db, request.stream(), format, chunk_size)
+
+@router.get("/api/visits", response_model=List[schemas.PageVisitResponse])
 def get_visits(
     url: str = Query(..., description="URL to fetch visits for"),
     limit: int = Query(50, description="Maximum number of visits to return", ge=1, le=100),
@@ -42,7 +55,7 @@ def get_visits(
 ):
     return PageVisitService.get_visits_by_url(db, url, limit)
 
-@app.get("/api/visits/paginated", response_model=schemas.PaginatedResponse[schemas.PageVisitResponse])
+@router.get("/api/visits/paginated", response_model=schemas.PaginatedResponse[schemas.PageVisitResponse])
 def get_visits_paginated(
     url: str = Query(..., description="URL to fetch visits for"),
     page: int = Query(1, description="Page number", ge=1),
@@ -51,7 +64,7 @@ def get_visits_paginated(
 ):
     return PageVisitService.get_visits_by_url_paginated(db, url, page, page_size)
 
-@app.delete("/api/visits")
+@router.delete("/api/visits")
 def delete_visits(
     url: str = Query(..., description="URL to delete visits for"),
     db: Session = Depends(get_db)
@@ -59,7 +72,7 @@ def delete_visits(
     count = PageVisitService.delete_visits_by_url(db, url)
     return {"deleted": count, "url": url}
 
-@app.get("/api/metrics/current", response_model=schemas.PageMetrics)
+@router.get("/api/metrics/current", response_model=schemas.PageMetrics)
 def get_current_metrics(
     url: str = Query(..., description="URL to fetch metrics for"),
     db: Session = Depends(get_db)
@@ -70,3 +83,4 @@ def get_current_metrics(
 def health_check():
     return {"status": "healthy"}
 
+app.include_router(async_routes.router if settings.db_async else router)
@@ -47,3 +47,13 @@ class BulkPageVisitResponse(BaseModel):
     failed: int
     results: List[PageVisitResponse]
 
+
+class IngestChunkResult(BaseModel):
+    chunk: int
+    accepted: int
+    rejected: int
+
+class StreamIngestResponse(BaseModel):
+    accepted: int
+    rejected: int
+    chunks: List[IngestChunkResult]
@@ -1,25 +1,47 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from starlette.concurrency import run_in_threadpool
+from typing import AsyncIterator, List, Optional, Tuple
+import csv
+import json
 import math
-from . import crud, schemas, models
+from . import async_crud, crud, schemas, models
+from .config import settings
 from .exceptions import NotFoundException, ValidationException
 from .utils import validate_url
 
 
+INGEST_FORMATS = ("ndjson", "csv")
+INGEST_CSV_FIELDS = ("url", "link_count", "word_count", "image_count")
+
+
+async def _iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Split a streamed request body into non-empty lines without buffering it whole."""
+    remainder = b""
+    async for chunk in body:
+        lines = (remainder + chunk).split(b"\n")
+        remainder = lines.pop()
+        for line in lines:
+            line = line.rstrip(b"\r")
+            if line.strip():
+                yield line
+    if remainder.strip():
+        yield remainder.rstrip(b"\r")
+
+
 class PageVisitService:
     @staticmethod
-    def create_visit(db: Session, visit: schemas.PageVisitCreate) -> schemas.PageVisitResponse:
+    def _validate_visit(visit: schemas.PageVisitCreate) -> schemas.PageVisitCreate:
         normalized_url = validate_url(visit.url)
         
         if visit.link_count < 0 or visit.word_count < 0 or visit.image_count < 0:
             raise ValidationException("Counts cannot be negative")
         
         visit.url = normalized_url
-        db_visit = crud.create_page_visit(db, visit)
-        return schemas.PageVisitResponse.model_validate(db_visit)
+        return visit
     
     @staticmethod
-    def create_visits_bulk(db: Session, bulk: schemas.BulkPageVisitCreate) -> schemas.BulkPageVisitResponse:
+    def _validate_bulk(bulk: schemas.BulkPageVisitCreate) -> Tuple[List[schemas.PageVisitCreate], int]:
         if not bulk.visits:
             raise ValidationException("No visits provided")
         
@@ -31,51 +53,27 @@ class PageVisitService:
         
         for visit in bulk.visits:
             try:
-                normalized_url = validate_url(visit.url)
-                if visit.link_count < 0 or visit.word_count < 0 or visit.image_count < 0:
-                    failed_count += 1
-                    continue
-                visit.url = normalized_url
-                validated_visits.append(visit)
+                validated_visits.append(PageVisitService._validate_visit(visit))
             except ValidationException:
                 failed_count += 1
-                continue
         
-        db_visits = crud.create_page_visits_bulk(db, validated_visits)
-        responses = [schemas.PageVisitResponse.model_validate(v) for v in db_visits]
-        
-        return schemas.BulkPageVisitResponse(
-            created=len(responses),
-            failed=failed_count,
-            results=responses
-        )
+        return validated_visits, failed_count
     
     @staticmethod
-    def get_visits_by_url(db: Session, url: str, limit: int = 50) -> List[schemas.PageVisitResponse]:
-        normalized_url = validate_url(url)
-        
-        if limit < 1 or limit > 100:
-            raise ValidationException("Limit must be between 1 and 100")
-        
-        visits = crud.get_visits_by_url(db, normalized_url, limit)
-        return [schemas.PageVisitResponse.model_validate(visit) for visit in visits]
-    
-    @staticmethod
-    def get_visits_by_url_paginated(
-        db: Session, 
-        url: str, 
-        page: int = 1, 
-        page_size: int = 50
-    ) -> schemas.PaginatedResponse[schemas.PageVisitResponse]:
-        normalized_url = validate_url(url)
-        
+    def _validate_page(page: int, page_size: int) -> None:
         if page < 1:
             raise ValidationException("Page must be >= 1")
         
         if page_size < 1 or page_size > 100:
             raise ValidationException("Page size must be between 1 and 100")
-        
-        visits, total = crud.get_visits_by_url_paginated(db, normalized_url, page, page_size)
+    
+    @staticmethod
+    def _build_page(
+        visits: list, 
+        total: int, 
+        page: int, 
+        page_size: int
+    ) -> schemas.PaginatedResponse[schemas.PageVisitResponse]:
         total_pages = math.ceil(total / page_size) if total > 0 else 0
         
         return schemas.PaginatedResponse(
@@ -91,11 +89,7 @@ class PageVisitService:
         )
     
     @staticmethod
-    def get_latest_metrics(db: Session, url: str) -> schemas.PageMetrics:
-        normalized_url = validate_url(url)
-        
-        latest = crud.get_latest_metrics(db, normalized_url)
-        
+    def _build_metrics(latest: Optional[models.PageVisit]) -> schemas.PageMetrics:
         if not latest:
             return schemas.PageMetrics(
                 link_count=0,
@@ -111,8 +105,198 @@ class PageVisitService:
             last_visited=latest.datetime_visited
         )
     
+    @staticmethod
+    def create_visit(db: Session, visit: schemas.PageVisitCreate) -> schemas.PageVisitResponse:
+        visit = PageVisitService._validate_visit(visit)
+        db_visit = crud.create_page_visit(db, visit)
+        return schemas.PageVisitResponse.model_validate(db_visit)
+    
+    @staticmethod
+    def create_visits_bulk(db: Session, bulk: schemas.BulkPageVisitCreate) -> schemas.BulkPageVisitResponse:
+        validated_visits, failed_count = PageVisitService._validate_bulk(bulk)
+        db_visits = crud.create_page_visits_bulk(db, validated_visits)
+        responses = [schemas.PageVisitResponse.model_validate(v) for v in db_visits]
+        
+        return schemas.BulkPageVisitResponse(
+            created=len(responses),
+            failed=failed_count,
+            results=responses
+        )
+    
+    @staticmethod
+    def get_visits_by_url(db: Session, url: str, limit: int = 50) -> List[schemas.PageVisitResponse]:
+        normalized_url = validate_url(url)
+        
+        if limit < 1 or limit > 100:
+            raise ValidationException("Limit must be between 1 and 100")
+        
+        visits = crud.get_visits_by_url(db, normalized_url, limit)
+        return [schemas.PageVisitResponse.model_validate(visit) for visit in visits]
+    
+    @staticmethod
+    def get_visits_by_url_paginated(
+        db: Session, 
+        url: str, 
+        page: int = 1, 
+        page_size: int = 50
+    ) -> schemas.PaginatedResponse[schemas.PageVisitResponse]:
+        normalized_url = validate_url(url)
+        PageVisitService._validate_page(page, page_size)
+        
+        visits, total = crud.get_visits_by_url_paginated(db, normalized_url, page, page_size)
+        return PageVisitService._build_page(visits, total, page, page_size)
+    
+    @staticmethod
+    def get_latest_metrics(db: Session, url: str) -> schemas.PageMetrics:
+        normalized_url = validate_url(url)
+        
+        latest = crud.get_latest_metrics(db, normalized_url)
+        return PageVisitService._build_metrics(latest)
+    
     @staticmethod
     def delete_visits_by_url(db: Session, url: str) -> int:
         normalized_url = validate_url(url)
         return crud.delete_visits_by_url(db, normalized_url)
 
+    
+    @staticmethod
+    def parse_ingest_line(
+        line: bytes, 
+        fmt: str, 
+        header: Optional[List[str]] = None
+    ) -> schemas.PageVisitCreate:
+        try:
+            text = line.decode("utf-8")
+            if fmt == "csv":
+                record = dict(zip(header, next(csv.reader([text]))))
+            else:
+                record = json.loads(text)
+            visit = schemas.PageVisitCreate.model_validate(record)
+        except (ValueError, csv.Error) as e:
+            raise ValidationException(f"Invalid record: {str(e)}")
+        
+        return PageVisitService._validate_visit(visit)
+    
+    @staticmethod
+    def ingest_visits_chunk(
+        db: Session, 
+        chunk: int, 
+        lines: List[bytes], 
+        fmt: str, 
+        header: Optional[List[str]] = None
+    ) -> schemas.IngestChunkResult:
+        accepted = []
+        rejected = 0
+        
+        for line in lines:
+            try:
+                accepted.append(PageVisitService.parse_ingest_line(line, fmt, header))
+            except ValidationException:
+                rejected += 1
+        
+        crud.copy_page_visits(db, accepted)
+        
+        return schemas.IngestChunkResult(chunk=chunk, accepted=len(accepted), rejected=rejected)
+    
+    @staticmethod
+    async def ingest_visits_stream(
+        db: Session, 
+        body: AsyncIterator[bytes], 
+        fmt: str = "ndjson", 
+        chunk_size: Optional[int] = None
+    ) -> schemas.StreamIngestResponse:
+        if fmt not in INGEST_FORMATS:
+            raise ValidationException(f"Format must be one of: {', '.join(INGEST_FORMATS)}")
+        
+        chunk_size = chunk_size or settings.ingest_chunk_size
+        if chunk_size < 1:
+            raise ValidationException("Chunk size must be >= 1")
+        
+        header = None
+        pending = []
+        results = []
+        
+        async def flush():
+            result = await run_in_threadpool(
+                PageVisitService.ingest_visits_chunk, db, len(results), pending[:], fmt, header
+            )
+            results.append(result)
+            pending.clear()
+        
+        async for line in _iter_lines(body):
+            if fmt == "csv" and header is None:
+                header = [field.strip() for field in next(csv.reader([line.decode("utf-8", "replace")]))]
+                missing = [field for field in INGEST_CSV_FIELDS if field not in header]
+                if missing:
+                    raise ValidationException(f"CSV header missing columns: {', '.join(missing)}")
+                continue
+            
+            pending.append(line)
+            if len(pending) >= chunk_size:
+                await flush()
+        
+        if pending:
+            await flush()
+        
+        return schemas.StreamIngestResponse(
+            accepted=sum(r.accepted for r in results),
+            rejected=sum(r.rejected for r in results),
+            chunks=results
+        )
+
+
+class AsyncPageVisitService:
+    """AsyncSession counterpart of PageVisitService, used when db_async is enabled."""
+    
+    @staticmethod
+    async def create_visit(db: AsyncSession, visit: schemas.PageVisitCreate) -> schemas.PageVisitResponse:
+        visit = PageVisitService._validate_visit(visit)
+        db_visit = await async_crud.create_page_visit(db, visit)
+        return schemas.PageVisitResponse.model_validate(db_visit)
+    
+    @staticmethod
+    async def create_visits_bulk(db: AsyncSession, bulk: schemas.BulkPageVisitCreate) -> schemas.BulkPageVisitResponse:
+        validated_visits, failed_count = PageVisitService._validate_bulk(bulk)
+        db_visits = await async_crud.create_page_visits_bulk(db, validated_visits)
+        responses = [schemas.PageVisitResponse.model_validate(v) for v in db_visits]
+        
+        return schemas.BulkPageVisitResponse(
+            created=len(responses),
+            failed=failed_count,
+            results=responses
+        )
+    
+    @staticmethod
+    async def get_visits_by_url(db: AsyncSession, url: str, limit: int = 50) -> List[schemas.PageVisitResponse]:
+        normalized_url = validate_url(url)
+        
+        if limit < 1 or limit > 100:
+            raise ValidationException("Limit must be between 1 and 100")
+        
+        visits = await async_crud.get_visits_by_url(db, normalized_url, limit)
+        return [schemas.PageVisitResponse.model_validate(visit) for visit in visits]
+    
+    @staticmethod
+    async def get_visits_by_url_paginated(
+        db: AsyncSession, 
+        url: str, 
+        page: int = 1, 
+        page_size: int = 50
+    ) -> schemas.PaginatedResponse[schemas.PageVisitResponse]:
+        normalized_url = validate_url(url)
+        PageVisitService._validate_page(page, page_size)
+        
+        visits, total = await async_crud.get_visits_by_url_paginated(db, normalized_url, page, page_size)
+        return PageVisitService._build_page(visits, total, page, page_size)
+    
+    @staticmethod
+    async def get_latest_metrics(db: AsyncSession, url: str) -> schemas.PageMetrics:
+        normalized_url = validate_url(url)
+        
+        latest = await async_crud.get_latest_metrics(db, normalized_url)
+        return PageVisitService._build_metrics(latest)
+    
+    @staticmethod
+    async def delete_visits_by_url(db: AsyncSession, url: str) -> int:
+        normalized_url = validate_url(url)
+        return await async_crud.delete_visits_by_url(db, normalized_url)
@@ -0,0 +1,138 @@
+"""
+Tests for the async database layer (AsyncSession crud, service and routes)
+"""
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from starlette.testclient import TestClient
+
+from app import async_crud, async_routes
+from app.config import Settings
+from app.database import Base, get_async_db
+from app.exceptions import ValidationException, register_exception_handlers
+from app.services import AsyncPageVisitService
+from app import schemas
+from .conftest import create_visit_dict, create_visit_schema
+
+async_engine = create_async_engine(
+    "sqlite+aiosqlite:///:memory:",
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
+AsyncTestingSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+@pytest.fixture
+async def async_db():
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with AsyncTestingSessionLocal() as session:
+        yield session
+    async with async_engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
+class TestAsyncDatabaseUrl:
+    def test_derives_asyncpg_url(self):
+        settings = Settings(database_url="postgresql://user:pass@db:5432/protego")
+        assert settings.async_database_url == "postgresql+asyncpg://user:pass@db:5432/protego"
+
+    def test_derives_aiosqlite_url(self):
+        settings = Settings(database_url="sqlite:///./test.db")
+        assert settings.async_database_url == "sqlite+aiosqlite:///./test.db"
+
+    def test_explicit_async_url_wins(self):
+        settings = Settings(
+            database_url="postgresql://db/protego",
+            database_async_url="postgresql+asyncpg://replica/protego"
+        )
+        assert settings.async_database_url == "postgresql+asyncpg://replica/protego"
+
+
+class TestAsyncCrud:
+    async def test_create_and_get_visits(self, async_db):
+        await async_crud.create_page_visit(async_db, create_visit_schema(link_count=1))
+        await async_crud.create_page_visit(async_db, create_visit_schema(link_count=2))
+        
+        visits = await async_crud.get_visits_by_url(async_db, "https://example.com")
+        
+        assert len(visits) == 2
+        assert visits[0].link_count == 2
+
+    async def test_create_page_visits_bulk(self, async_db):
+        visits = [create_visit_schema(url=f"https://example.com/{i}") for i in range(3)]
+        
+        rows = await async_crud.create_page_visits_bulk(async_db, visits)
+        
+        assert [r.url for r in rows] == [v.url for v in visits]
+        assert await async_crud.create_page_visits_bulk(async_db, []) == []
+
+    async def test_paginated_and_latest(self, async_db):
+        for i in range(5):
+            await async_crud.create_page_visit(async_db, create_visit_schema(link_count=i))
+        
+        visits, total = await async_crud.get_visits_by_url_paginated(async_db, "https://example.com", 2, 2)
+        latest = await async_crud.get_latest_metrics(async_db, "https://example.com")
+        
+        assert total == 5
+        assert len(visits) == 2
+        assert latest.link_count == 4
+
+    async def test_delete_visits_by_url(self, async_db):
+        for i in range(3):
+            await async_crud.create_page_visit(async_db, create_visit_schema())
+        
+        assert await async_crud.delete_visits_by_url(async_db, "https://example.com") == 3
+        assert await async_crud.get_latest_metrics(async_db, "https://example.com") is None
+
+
+class TestAsyncPageVisitService:
+    async def test_create_visit_normalizes_url(self, async_db):
+        result = await AsyncPageVisitService.create_visit(async_db, create_visit_schema())
+        assert result.url == "https://example.com/"
+
+    async def test_create_visit_negative_counts(self, async_db):
+        with pytest.raises(ValidationException):
+            await AsyncPageVisitService.create_visit(async_db, create_visit_schema(link_count=-1))
+
+    async def test_get_metrics_no_data(self, async_db):
+        metrics = await AsyncPageVisitService.get_latest_metrics(async_db, "https://nonexistent.com")
+        assert metrics.link_count == 0
+        assert metrics.last_visited is None
+
+
+class TestAsyncRoutes:
+    @pytest.fixture
+    def async_client(self, async_db):
+        app = FastAPI()
+        register_exception_handlers(app)
+        app.include_router(async_routes.router)
+        
+        async def override_get_async_db():
+            yield async_db
+        
+        app.dependency_overrides[get_async_db] = override_get_async_db
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+
+    def test_full_workflow(self, async_client):
+        response = async_client.post("/api/visits", json=create_visit_dict())
+        assert response.status_code == 200
+        
+        bulk = async_client.post("/api/visits/bulk", json={"visits": [create_visit_dict(link_count=3)]})
+        assert bulk.json()["created"] == 1
+        
+        page = async_client.get("/api/visits/paginated?url=https://example.com&page=1&page_size=10")
+        assert page.json()["meta"]["total"] == 2
+        
+        metrics = async_client.get("/api/metrics/current?url=https://example.com")
+        assert metrics.json()["link_count"] == 3
+        
+        deleted = async_client.delete("/api/visits?url=https://example.com")
+        assert deleted.json()["deleted"] == 2
+
+    def test_validation_error(self, async_client):
+        response = async_client.get("/api/visits?url=ftp://example.com")
+        assert response.status_code == 422
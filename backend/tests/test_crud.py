@@ -50,6 +50,58 @@ class TestCreatePageVisit:
         assert result1.url == result2.url
 
 
+class TestCreatePageVisitsBulk:
+    def test_create_page_visits_bulk_returns_rows_in_order(self, db):
+        visits = [
+            schemas.PageVisitCreate(
+                url=f"https://example.com/{i}",
+                link_count=i,
+                word_count=i * 10,
+                image_count=i * 2
+            )
+            for i in range(5)
+        ]
+        
+        results = crud.create_page_visits_bulk(db, visits)
+        
+        assert len(results) == 5
+        assert [r.url for r in results] == [v.url for v in visits]
+        assert [r.link_count for r in results] == [0, 1, 2, 3, 4]
+        assert all(r.id is not None for r in results)
+        assert all(isinstance(r.datetime_visited, datetime) for r in results)
+
+    def test_create_page_visits_bulk_single_statement(self, db):
+        from sqlalchemy import event
+        
+        statements = []
+        
+        def count_statements(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        visits = [
+            schemas.PageVisitCreate(
+                url="https://example.com",
+                link_count=i,
+                word_count=i,
+                image_count=i
+            )
+            for i in range(20)
+        ]
+        
+        bind = db.get_bind()
+        event.listen(bind, "before_cursor_execute", count_statements)
+        try:
+            crud.create_page_visits_bulk(db, visits)
+        finally:
+            event.remove(bind, "before_cursor_execute", count_statements)
+        
+        assert len(statements) == 1
+        assert statements[0].lstrip().upper().startswith("INSERT")
+
+    def test_create_page_visits_bulk_empty(self, db):
+        assert crud.create_page_visits_bulk(db, []) == []
+
+
 class TestGetVisitsByUrl:
     def test_get_visits_by_url_single_visit(self, db):
         visit_data = schemas.PageVisitCreate(
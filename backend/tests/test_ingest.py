@@ -0,0 +1,104 @@
+"""
+Tests for the streaming NDJSON/CSV ingestion endpoint
+"""
+
+import json
+import pytest
+from app import crud, schemas
+from app.exceptions import ValidationException
+from app.services import PageVisitService
+from .conftest import create_visit_dict, create_visit_schema
+
+
+def ndjson(records):
+    return "\n".join(json.dumps(record) for record in records) + "\n"
+
+
+class TestIngestEndpoint:
+    """Test POST /api/visits/ingest"""
+    
+    def test_ingest_ndjson_in_chunks(self, client, db):
+        """Test that rows are accepted and reported per chunk"""
+        body = ndjson([create_visit_dict(url=f"https://example.com/{i}") for i in range(5)])
+        
+        response = client.post("/api/visits/ingest?format=ndjson&chunk_size=2", content=body)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["accepted"] == 5
+        assert data["rejected"] == 0
+        assert [c["accepted"] for c in data["chunks"]] == [2, 2, 1]
+        assert [c["chunk"] for c in data["chunks"]] == [0, 1, 2]
+        
+        visits = client.get("/api/visits?url=https://example.com/3").json()
+        assert len(visits) == 1
+    
+    def test_ingest_ndjson_rejects_invalid_rows(self, client, db):
+        """Test that invalid rows are counted without failing the request"""
+        body = ndjson([
+            create_visit_dict(),
+            create_visit_dict(url="ftp://example.com"),
+            create_visit_dict(link_count=-1),
+            {"url": "https://example.com"},
+        ]) + "not json\n"
+        
+        response = client.post("/api/visits/ingest", content=body)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["accepted"] == 1
+        assert data["rejected"] == 4
+    
+    def test_ingest_csv_with_header(self, client, db):
+        """Test CSV ingestion with columns in any order"""
+        body = (
+            "word_count,url,link_count,image_count\r\n"
+            "500,https://example.com/a,10,5\r\n"
+            "600,\"https://example.com/b?x=1,2\",20,6\r\n"
+            "bad,https://example.com/c,1,1\r\n"
+        )
+        
+        response = client.post("/api/visits/ingest?format=csv", content=body)
+        assert response.status_code == 200
+        
+        data = response.json()
+        assert data["accepted"] == 2
+        assert data["rejected"] == 1
+    
+    def test_ingest_csv_missing_columns(self, client):
+        """Test that an incomplete CSV header is rejected"""
+        response = client.post("/api/visits/ingest?format=csv", content="url,link_count\n")
+        assert response.status_code == 422
+    
+    def test_ingest_unknown_format(self, client):
+        """Test that unsupported formats are rejected"""
+        response = client.post("/api/visits/ingest?format=xml", content="<visits/>")
+        assert response.status_code == 422
+    
+    def test_ingest_empty_body(self, client, db):
+        """Test that an empty body ingests nothing"""
+        response = client.post("/api/visits/ingest", content="")
+        assert response.status_code == 200
+        assert response.json() == {"accepted": 0, "rejected": 0, "chunks": []}
+
+
+class TestIngestService:
+    """Test ingestion helpers"""
+    
+    def test_parse_ingest_line_normalizes_url(self):
+        line = json.dumps(create_visit_dict(url="HTTPS://Example.com/path/")).encode()
+        visit = PageVisitService.parse_ingest_line(line, "ndjson")
+        assert visit.url == "https://example.com/path"
+    
+    def test_parse_ingest_line_invalid_utf8(self):
+        with pytest.raises(ValidationException):
+            PageVisitService.parse_ingest_line(b"\xff\xfe", "ndjson")
+    
+    def test_copy_page_visits(self, db):
+        visits = [create_visit_schema(url=f"https://example.com/{i}") for i in range(3)]
+        
+        assert crud.copy_page_visits(db, visits) == 3
+        assert len(crud.get_visits_by_url(db, "https://example.com/1")) == 1
+    
+    def test_copy_page_visits_empty(self, db):
+        assert crud.copy_page_visits(db, []) == 0